@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import yt_dlp
 import sqlite3
@@ -11,6 +11,11 @@ from pathlib import Path
 import subprocess
 import platform
 import shutil
+import hashlib
+import zlib
+import urllib.request
+from contextlib import contextmanager
+from itertools import islice
 
 
 app = Flask(__name__, static_folder='build', static_url_path='')
@@ -21,21 +26,39 @@ BASE_DIR = Path(__file__).parent
 DATA_DIR = BASE_DIR / 'data'
 DB_PATH = DATA_DIR / 'playlists.db'
 COOKIES_PATH = DATA_DIR / 'cookies.txt'
+ARTWORK_DIR = DATA_DIR / 'artwork'
+BACKUP_DIR = DATA_DIR / 'backups'
 DATA_DIR.mkdir(exist_ok=True)
+ARTWORK_DIR.mkdir(exist_ok=True)
 
 # Global state
 active_downloads = {}
 info_thread = None
 scheduler_thread = None
+backup_thread = None
 last_schedule_run_date = None # Prevents scheduler from running multiple times a day
 global_logs = []
 MAX_LOGS = 100
+SYNC_CHUNK_SIZE = 500 # Playlist entries reconciled per batch; bounds memory for huge playlists
+info_syncs_in_progress = set() # Playlist IDs with a running info sync
+info_sync_lock = threading.Lock()
+BACKUP_PAGES_PER_STEP = 256 # Pages copied per online-backup step; writers wait at most one step
+BACKUP_MAX_RESTARTS = 3
+EXPORT_FORMAT_VERSION = 1
+SEARCH_MIN_TERM_LENGTH = 2 # Shorter words match too much to rank quickly, so they are ignored
+SEARCH_MAX_CANDIDATES = 500 # Broad queries rank only this many of the newest matches
+artwork_lock = threading.Lock() # Guards the artwork cache table and artwork_in_flight
+artwork_in_flight = {} # (cache key, size) -> Event set once that cover is cached
+artwork_in_use = {} # cover hash -> number of songs currently embedding it; eviction skips these
 
 def init_db():
     """Initialize SQLite database"""
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
     
+    # WAL lets readers (UI, backups, exports) run alongside the downloader's writes
+    c.execute('PRAGMA journal_mode=WAL')
+    
     # Playlists table
     c.execute('''CREATE TABLE IF NOT EXISTS playlists (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -71,9 +94,108 @@ def init_db():
         value TEXT
     )''')
     
+    # Artwork cache: thumbnail URL / album key + cover size -> content hash of the prepared cover file
+    c.execute('''CREATE TABLE IF NOT EXISTS artwork_cache (
+        key TEXT NOT NULL,
+        art_size INTEGER NOT NULL,
+        hash TEXT NOT NULL,
+        size INTEGER DEFAULT 0,
+        source_bytes INTEGER DEFAULT 0,
+        last_used TIMESTAMP,
+        PRIMARY KEY (key, art_size)
+    )''')
+    
+    # Lookups by song (FTS triggers, cleanup) would otherwise scan the composite PK
+    c.execute('CREATE INDEX IF NOT EXISTS idx_playlist_songs_song ON playlist_songs(song_id)')
+    
+    init_search_index(c)
+    
     conn.commit()
     conn.close()
 
+# Space-separated names of every playlist a song belongs to
+SONG_PLAYLIST_NAMES_SQL = '''(SELECT group_concat(p.name, ' ')
+                              FROM playlist_songs ps
+                              JOIN playlists p ON p.id = ps.playlist_id
+                              WHERE ps.song_id = {song_id})'''
+
+def init_search_index(c):
+    """
+    Create the FTS5 search index over songs (rowid = songs.id) and the
+    triggers that keep it in sync with songs, playlist_songs and playlists.
+    """
+    c.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'songs_fts'")
+    existing = c.fetchone()
+    needs_backfill = existing is None
+    
+    # Prefix indexes are fixed at creation; rebuild an index made with older options
+    if existing and "prefix = '2 3 4'" not in existing[0]:
+        c.execute('DROP TABLE songs_fts')
+        needs_backfill = True
+    
+    try:
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS songs_fts USING fts5(
+            title, artist, playlists,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3 4'
+        )''')
+    except sqlite3.OperationalError as e:
+        log_message(f"WARNING: SQLite FTS5 unavailable, search disabled: {e}")
+        return
+    
+    # Title matches weigh most, then artist, then playlist names (used by ORDER BY rank)
+    c.execute("INSERT INTO songs_fts (songs_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 1.0)')")
+    
+    triggers = {
+        'songs_fts_ai': f'''AFTER INSERT ON songs BEGIN
+            INSERT INTO songs_fts (rowid, title, artist, playlists)
+            VALUES (NEW.id, NEW.title, NEW.artist, {SONG_PLAYLIST_NAMES_SQL.format(song_id='NEW.id')});
+        END''',
+        'songs_fts_au': '''AFTER UPDATE OF title, artist ON songs BEGIN
+            UPDATE songs_fts SET title = NEW.title, artist = NEW.artist WHERE rowid = NEW.id;
+        END''',
+        'songs_fts_ad': '''AFTER DELETE ON songs BEGIN
+            DELETE FROM songs_fts WHERE rowid = OLD.id;
+        END''',
+        'playlist_songs_fts_ai': f'''AFTER INSERT ON playlist_songs BEGIN
+            UPDATE songs_fts SET playlists = {SONG_PLAYLIST_NAMES_SQL.format(song_id='NEW.song_id')}
+            WHERE rowid = NEW.song_id;
+        END''',
+        'playlist_songs_fts_ad': f'''AFTER DELETE ON playlist_songs BEGIN
+            UPDATE songs_fts SET playlists = {SONG_PLAYLIST_NAMES_SQL.format(song_id='OLD.song_id')}
+            WHERE rowid = OLD.song_id;
+        END''',
+        'playlists_fts_au': f'''AFTER UPDATE OF name ON playlists BEGIN
+            UPDATE songs_fts SET playlists = {SONG_PLAYLIST_NAMES_SQL.format(song_id='songs_fts.rowid')}
+            WHERE rowid IN (SELECT song_id FROM playlist_songs WHERE playlist_id = NEW.id);
+        END''',
+        'playlists_fts_ad': f'''AFTER DELETE ON playlists BEGIN
+            UPDATE songs_fts SET playlists = {SONG_PLAYLIST_NAMES_SQL.format(song_id='songs_fts.rowid')}
+            WHERE rowid IN (SELECT song_id FROM playlist_songs WHERE playlist_id = OLD.id);
+        END''',
+    }
+    for name, body in triggers.items():
+        c.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+    
+    if needs_backfill:
+        # Existing libraries: index every song once
+        c.execute(f'''INSERT INTO songs_fts (rowid, title, artist, playlists)
+                      SELECT s.id, s.title, s.artist, {SONG_PLAYLIST_NAMES_SQL.format(song_id='s.id')}
+                      FROM songs s''')
+
+def build_fts_query(text):
+    """
+    Turn free text into an FTS5 query where every word is a quoted prefix term.
+    Words shorter than SEARCH_MIN_TERM_LENGTH are dropped.
+    """
+    terms = []
+    for word in text.split():
+        if len(word) < SEARCH_MIN_TERM_LENGTH:
+            continue
+        word = word.replace('"', '""')
+        terms.append(f'"{word}"*')
+    return ' '.join(terms)
+
 def get_settings():
     """Get current settings from database"""
     conn = sqlite3.connect(DB_PATH)
@@ -89,7 +211,12 @@ def get_settings():
         'info_refresh_interval': '5',  # New: Fast UI refresh (seconds)
         'schedule_enabled': 'true',     # New: Controls the scheduled download
         'schedule_days': '1',           # New: Run every X days
-        'schedule_time': '03:00'        # New: Run at this time
+        'schedule_time': '03:00',       # New: Run at this time
+        'artwork_size': '500',          # Cover art is cropped square and resized to this (px)
+        'artwork_cache_mb': '100',      # Max disk used by the shared artwork cache
+        'backup_enabled': 'true',       # Periodic online backups of the database
+        'backup_interval_days': '7',
+        'backup_keep': '4'              # Number of backups retained in data/backups
     }
     
     for key, value in defaults.items():
@@ -186,9 +313,8 @@ def is_termux():
 def get_ydl_opts(output_dir, bitrate, playlist_id, song_id):
     opts = {
         'format': 'bestaudio/best',
-        'writethumbnail': True,
         'addmetadata': True,
-        'embedthumbnail': True,
+        # Thumbnails are handled by the shared artwork cache (see embed_artwork)
         'postprocessors': [
             {
                 'key': 'FFmpegExtractAudio',
@@ -196,7 +322,6 @@ def get_ydl_opts(output_dir, bitrate, playlist_id, song_id):
                 'preferredquality': bitrate,
             },
             {'key': 'FFmpegMetadata'},
-            {'key': 'EmbedThumbnail'},
         ],
         'outtmpl': os.path.join(output_dir, '%(title)s - %(artist)s.%(ext)s'),
         'quiet': True,
@@ -220,7 +345,6 @@ def get_ydl_opts(output_dir, bitrate, playlist_id, song_id):
                 'preferredcodec': 'mp3',
                 'preferredquality': bitrate,
             },
-            {'key': 'EmbedThumbnail', 'already_have_thumbnail': False},
             {'key': 'FFmpegMetadata', 'add_metadata': True},
         ]
         
@@ -234,6 +358,263 @@ def get_ydl_opts(output_dir, bitrate, playlist_id, song_id):
     
     return opts
 
+def get_ffmpeg_executable():
+    """Return the ffmpeg binary to invoke directly"""
+    return shutil.which('ffmpeg') or 'ffmpeg'
+
+def evict_artwork_cache(max_bytes):
+    """
+    Drop least-recently-used cover files until the cache fits in max_bytes.
+    Several keys can map to the same hash, so eviction works per hash.
+    Covers that are being embedded right now are never removed.
+    Caller must hold artwork_lock.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    c.execute('''SELECT hash, MAX(size), MAX(last_used)
+                 FROM artwork_cache
+                 GROUP BY hash
+                 ORDER BY MAX(last_used) ASC''')
+    entries = c.fetchall()
+    total = sum(size or 0 for _, size, _ in entries)
+
+    evicted = 0
+    for art_hash, size, _ in entries:
+        if total <= max_bytes:
+            break
+        if artwork_in_use.get(art_hash):
+            continue
+        cover_path = ARTWORK_DIR / f'{art_hash}.jpg'
+        if cover_path.exists():
+            try:
+                os.remove(cover_path)
+            except OSError as e:
+                log_message(f"Artwork cache: could not remove {cover_path.name}: {e}")
+                continue
+        c.execute('DELETE FROM artwork_cache WHERE hash = ?', (art_hash,))
+        total -= size or 0
+        evicted += 1
+
+    conn.commit()
+    conn.close()
+
+    if evicted > 0:
+        log_message(f"Artwork cache: Evicted {evicted} covers to stay under {max_bytes // (1024 * 1024)} MB.")
+
+def get_artwork_keys(info):
+    """
+    Cache keys for a song's cover, most specific first.
+    YouTube Music gives every track its own thumbnail URL, but tracks of one
+    album share the same cover, so the album key lets later tracks skip the fetch.
+    """
+    keys = []
+    thumbnail_url = info.get('thumbnail')
+    if thumbnail_url:
+        keys.append(f'url:{thumbnail_url}')
+    album = info.get('album')
+    artist = info.get('artist') or info.get('uploader')
+    if album and artist:
+        keys.append(f'album:{artist}|{album}'.lower())
+    return keys
+
+def lookup_artwork(keys, art_size):
+    """
+    Find a cached cover for any of the keys at this size and mark it used.
+    Keys are tried in order, so the most specific match wins.
+    Returns (art_hash, cover_path, source_bytes) or None. Caller must hold artwork_lock.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    key_order = ' '.join(f'WHEN ? THEN {position}' for position in range(len(keys)))
+    c.execute(f'''SELECT hash, source_bytes FROM artwork_cache
+                  WHERE art_size = ? AND key IN ({','.join('?' * len(keys))})
+                  ORDER BY CASE key {key_order} END''',
+              (art_size, *keys, *keys))
+    found = None
+    for art_hash, source_bytes in c.fetchall():
+        cover_path = ARTWORK_DIR / f'{art_hash}.jpg'
+        if cover_path.exists():
+            found = (art_hash, cover_path, source_bytes or 0)
+            break
+        # File vanished from disk: forget the mapping
+        c.execute('DELETE FROM artwork_cache WHERE hash = ?', (art_hash,))
+
+    if found:
+        art_hash, cover_path, source_bytes = found
+        # Record keys we didn't know yet (e.g. this track's URL) against the cover
+        # we reused; keys already mapped to another cover keep their mapping
+        now = datetime.now()
+        c.executemany('''INSERT OR IGNORE INTO artwork_cache (key, art_size, hash, size, source_bytes, last_used)
+                         VALUES (?, ?, ?, ?, ?, ?)''',
+                      [(key, art_size, art_hash, cover_path.stat().st_size, source_bytes, now) for key in keys])
+        c.execute('UPDATE artwork_cache SET last_used = ? WHERE hash = ?', (now, art_hash))
+
+    conn.commit()
+    conn.close()
+    return found
+
+def render_artwork(thumbnail_url, art_size):
+    """
+    Download a thumbnail and render it as a square cover in the cache.
+    Returns (art_hash, cover_path, source_bytes). Runs without artwork_lock;
+    files are written under temporary names and moved into place atomically.
+    """
+    with urllib.request.urlopen(thumbnail_url, timeout=30) as response:
+        raw = response.read()
+
+    # Hash the source bytes plus the target size so a size change re-renders
+    art_hash = hashlib.sha1(raw + str(art_size).encode()).hexdigest()
+    cover_path = ARTWORK_DIR / f'{art_hash}.jpg'
+
+    if not cover_path.exists():
+        part = f'{art_hash}.{threading.get_ident()}.part'
+        raw_path = ARTWORK_DIR / f'{part}.src'
+        tmp_path = ARTWORK_DIR / f'{part}.jpg'
+        raw_path.write_bytes(raw)
+        try:
+            # Centre-crop to a square, then scale to the configured size
+            subprocess.run(
+                [get_ffmpeg_executable(), '-y', '-loglevel', 'error',
+                 '-i', str(raw_path),
+                 '-vf', f"crop='min(iw,ih)':'min(iw,ih)',scale={art_size}:{art_size}",
+                 '-frames:v', '1', str(tmp_path)],
+                capture_output=True,
+                check=True
+            )
+            os.replace(tmp_path, cover_path)
+        finally:
+            for path in (raw_path, tmp_path):
+                if path.exists():
+                    os.remove(path)
+
+    return art_hash, cover_path, len(raw)
+
+def get_cached_artwork(info, settings):
+    """
+    Return (art_hash, cover_path, fetched_bytes, saved_bytes) for a song's cover.
+    A cover already cached under the song's thumbnail URL or album is reused
+    without downloading anything; otherwise the thumbnail is fetched and
+    rendered once, while other threads needing the same cover wait for it.
+    The cover is marked in use; call release_artwork(art_hash) when done with it.
+    """
+    keys = get_artwork_keys(info)
+    if not keys or not info.get('thumbnail'):
+        return None
+
+    try:
+        art_size = max(int(settings.get('artwork_size', '500')), 64)
+    except ValueError:
+        art_size = 500
+    try:
+        max_bytes = max(int(settings.get('artwork_cache_mb', '100')), 1) * 1024 * 1024
+    except ValueError:
+        max_bytes = 100 * 1024 * 1024
+
+    while True:
+        with artwork_lock:
+            cached = lookup_artwork(keys, art_size)
+            if cached:
+                art_hash, cover_path, source_bytes = cached
+                artwork_in_use[art_hash] = artwork_in_use.get(art_hash, 0) + 1
+                return art_hash, cover_path, 0, source_bytes
+
+            # Someone else is already fetching this cover: wait, then look again
+            pending = next((artwork_in_flight[(key, art_size)] for key in keys
+                            if (key, art_size) in artwork_in_flight), None)
+            if pending is None:
+                done = threading.Event()
+                for key in keys:
+                    artwork_in_flight[(key, art_size)] = done
+                break
+        pending.wait()
+
+    try:
+        # render_artwork skips ffmpeg when the cover file already exists; if an
+        # eviction removes that file before we register it, render once more
+        for _ in range(2):
+            art_hash, cover_path, source_bytes = render_artwork(info['thumbnail'], art_size)
+
+            with artwork_lock:
+                if not cover_path.exists():
+                    continue
+                artwork_in_use[art_hash] = artwork_in_use.get(art_hash, 0) + 1
+
+                conn = sqlite3.connect(DB_PATH)
+                c = conn.cursor()
+                now = datetime.now()
+                c.executemany('''INSERT OR REPLACE INTO artwork_cache (key, art_size, hash, size, source_bytes, last_used)
+                                 VALUES (?, ?, ?, ?, ?, ?)''',
+                              [(key, art_size, art_hash, cover_path.stat().st_size, source_bytes, now) for key in keys])
+                conn.commit()
+                conn.close()
+
+                evict_artwork_cache(max_bytes)
+                break
+        else:
+            raise FileNotFoundError(f'Cover {cover_path.name} was evicted while rendering')
+    finally:
+        with artwork_lock:
+            for key in keys:
+                artwork_in_flight.pop((key, art_size), None)
+        done.set()
+
+    return art_hash, cover_path, source_bytes, 0
+
+def release_artwork(art_hash):
+    """Drop a song's hold on a cover taken by get_cached_artwork"""
+    with artwork_lock:
+        remaining = artwork_in_use.get(art_hash, 0) - 1
+        if remaining > 0:
+            artwork_in_use[art_hash] = remaining
+        else:
+            artwork_in_use.pop(art_hash, None)
+
+def embed_artwork(filename, info, output_dir, settings):
+    """
+    Embed cached cover art into a downloaded song.
+    Uses a stream copy so ffmpeg only remuxes; no image conversion per song.
+    Returns (fetched_bytes, saved_bytes), or None if nothing was embedded.
+    """
+    if not filename or not info:
+        return None
+
+    song_path = Path(output_dir) / filename
+    if not song_path.exists():
+        return None
+
+    tmp_path = song_path.with_name(f'{song_path.stem}.artwork{song_path.suffix}')
+    art_hash = None
+    try:
+        cached = get_cached_artwork(info, settings)
+        if not cached:
+            return None
+        art_hash, cover_path, fetched_bytes, saved_bytes = cached
+
+        subprocess.run(
+            [get_ffmpeg_executable(), '-y', '-loglevel', 'error',
+             '-i', str(song_path), '-i', str(cover_path),
+             '-map', '0:a', '-map', '1:0', '-c', 'copy',
+             '-id3v2_version', '3',
+             '-metadata:s:v', 'title=Album cover',
+             '-metadata:s:v', 'comment=Cover (front)',
+             '-disposition:v', 'attached_pic',
+             str(tmp_path)],
+            capture_output=True,
+            check=True
+        )
+        os.replace(tmp_path, song_path)
+        return fetched_bytes, saved_bytes
+
+    except Exception as e:
+        log_message(f"Artwork embedding failed for {filename}: {e}")
+        if tmp_path.exists():
+            os.remove(tmp_path)
+        return None
+
+    finally:
+        if art_hash:
+            release_artwork(art_hash)
+
 def test_ffmpeg_thumbnail_support():
     """Test if FFmpeg supports thumbnail embedding"""
     try:
@@ -253,8 +634,13 @@ def test_ffmpeg_thumbnail_support():
     except Exception as e:
         log_message(f"FFmpeg check failed: {e}")
     
-def fetch_playlist_info(url):
-    """Fetch playlist information without downloading"""
+@contextmanager
+def open_playlist_stream(url):
+    """
+    Open a playlist without downloading and yield (title, entries).
+    Entries are produced lazily page by page, so they must be consumed
+    inside the with-block while the YoutubeDL instance is still open.
+    """
     opts = {
         'quiet': True,
         'no_warnings': True,
@@ -266,14 +652,37 @@ def fetch_playlist_info(url):
         opts['cookiefile'] = str(COOKIES_PATH)
     
     with yt_dlp.YoutubeDL(opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-        return info
+        # process=False keeps 'entries' as a generator instead of a fully built list
+        info = ydl.extract_info(url, download=False, process=False)
+        
+        # Follow redirects (e.g. music.youtube.com -> youtube.com playlist)
+        for _ in range(5):
+            if info.get('_type') not in ('url', 'url_transparent'):
+                break
+            outer = info
+            info = ydl.extract_info(outer['url'], download=False, ie_key=outer.get('ie_key'), process=False)
+            if outer.get('_type') == 'url_transparent':
+                # Same as yt-dlp's process_ie_result: the outer result's fields (e.g. title) win
+                exempted_fields = {'_type', 'url', 'ie_key', 'id', 'extractor', 'extractor_key'}
+                info = {**info, **{k: v for k, v in outer.items() if v is not None and k not in exempted_fields}}
+        
+        yield info.get('title', 'Unknown Playlist'), iter(info.get('entries') or [])
+
+def iter_chunks(iterable, size):
+    """Yield lists of at most `size` items from any iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
 
-def sync_db_with_youtube_info(playlist_id, youtube_info):
+def sync_db_with_youtube_info(playlist_id, youtube_entries):
     """
+    Streaming reconciliation; memory stays bounded by SYNC_CHUNK_SIZE.
     1. Check for locally deleted files and reset 'downloaded' status.
-    2. Check for YouTube removals and delete orphaned files/records.
-    3. Add new songs from YouTube.
+    2. Add/link songs from YouTube, remembering seen IDs in a TEMP table.
+    3. Check for YouTube removals and delete orphaned files/records.
     4. Update total count.
     """
     conn = sqlite3.connect(DB_PATH)
@@ -283,84 +692,86 @@ def sync_db_with_youtube_info(playlist_id, youtube_info):
     output_dir = settings['output_dir']
     
     # 1. Check for locally deleted files (Downloaded=1 but file is MISSING)
-    c.execute('''SELECT s.id, s.filename
-                 FROM songs s
-                 JOIN playlist_songs ps ON s.id = ps.song_id
-                 WHERE ps.playlist_id = ? AND s.downloaded = 1''', (playlist_id,))
-    
     local_cleanup_count = 0
-    for song_id, filename in c.fetchall():
-        if filename:
-            full_path = Path(output_dir) / filename
-            if not full_path.exists():
-                # File is gone from disk, reset downloaded status
-                c.execute('UPDATE songs SET downloaded = 0 WHERE id = ?', (song_id,))
-                local_cleanup_count += 1
+    last_id = 0
+    while True:
+        c.execute('''SELECT s.id, s.filename
+                     FROM songs s
+                     JOIN playlist_songs ps ON s.id = ps.song_id
+                     WHERE ps.playlist_id = ? AND s.downloaded = 1 AND s.id > ?
+                     ORDER BY s.id LIMIT ?''', (playlist_id, last_id, SYNC_CHUNK_SIZE))
+        rows = c.fetchall()
+        if not rows:
+            break
+        
+        # File is gone from disk, reset downloaded status
+        missing = [(song_id,) for song_id, filename in rows
+                   if filename and not (Path(output_dir) / filename).exists()]
+        c.executemany('UPDATE songs SET downloaded = 0 WHERE id = ?', missing)
+        local_cleanup_count += len(missing)
+        last_id = rows[-1][0]
+    conn.commit()
 
     if local_cleanup_count > 0:
         log_message(f"Local cleanup: Reset {local_cleanup_count} songs for playlist ID {playlist_id} because files were manually deleted.")
 
-    # 2. Get current songs linked to this playlist from the database
-    c.execute('''SELECT s.id, s.video_id, s.filename
-                 FROM songs s
-                 JOIN playlist_songs ps ON s.id = ps.song_id
-                 WHERE ps.playlist_id = ?''', (playlist_id,))
-    db_songs = {video_id: {'id': song_id, 'filename': filename} for song_id, video_id, filename in c.fetchall()}
-    db_video_ids = set(db_songs.keys())
-    
-    # Get fresh songs from YouTube info
-    youtube_entries = youtube_info.get('entries', [])
-    youtube_video_ids = set(entry.get('id') for entry in youtube_entries if entry.get('id'))
+    # 2. Add/Link New Songs, one chunk at a time, committing after each chunk.
+    # sync_seen is a per-connection TEMP table recording every ID streamed so far.
+    c.execute('CREATE TEMP TABLE IF NOT EXISTS sync_seen (video_id TEXT PRIMARY KEY)')
     
-    # Identify songs removed from YouTube (DB but not YouTube)
-    songs_to_delete = db_video_ids - youtube_video_ids
+    total_songs = 0
+    added_count = 0
+    for chunk in iter_chunks(youtube_entries, SYNC_CHUNK_SIZE):
+        total_songs += len(chunk)
+        rows = [(entry['id'], entry.get('title') or 'Unknown')
+                for entry in chunk if entry and entry.get('id')]
+        if not rows:
+            continue
+        video_ids = [(video_id,) for video_id, _ in rows]
+        
+        # rowcount excludes rows written by triggers (e.g. the search index)
+        c.executemany('''INSERT OR IGNORE INTO songs (video_id, title, downloaded)
+                         VALUES (?, ?, 0)''', rows)
+        added_count += c.rowcount
+        
+        # Link song to playlist (INSERT OR IGNORE prevents duplicates)
+        c.executemany('''INSERT OR IGNORE INTO playlist_songs (playlist_id, song_id)
+                         SELECT ?, id FROM songs WHERE video_id = ?''',
+                      [(playlist_id, video_id) for video_id, _ in rows])
+        c.executemany('INSERT OR IGNORE INTO sync_seen (video_id) VALUES (?)', video_ids)
+        conn.commit()
     
-    # Perform YouTube Cleanup (Deletion from DB and Disk)
+    # 3. Perform YouTube Cleanup (DB but not YouTube). Only reached once the
+    # whole stream was consumed, so a failed fetch never deletes anything.
     deleted_count = 0
-    for video_id in songs_to_delete:
-        song_data = db_songs[video_id]
-        song_id = song_data['id']
-        filename = song_data['filename']
+    last_id = 0
+    while True:
+        c.execute('''SELECT s.id, s.filename
+                     FROM songs s
+                     JOIN playlist_songs ps ON s.id = ps.song_id
+                     WHERE ps.playlist_id = ? AND s.id > ?
+                       AND s.video_id NOT IN (SELECT video_id FROM sync_seen)
+                     ORDER BY s.id LIMIT ?''', (playlist_id, last_id, SYNC_CHUNK_SIZE))
+        rows = c.fetchall()
+        if not rows:
+            break
         
-        # Delete file from disk
-        if filename and remove_deleted_file(filename, output_dir):
-            deleted_count += 1
+        for song_id, filename in rows:
+            # Delete file from disk
+            if filename and remove_deleted_file(filename, output_dir):
+                deleted_count += 1
         
         # Delete song link and song record from DB
-        c.execute('DELETE FROM playlist_songs WHERE playlist_id = ? AND song_id = ?', (playlist_id, song_id))
-        c.execute('DELETE FROM songs WHERE id = ?', (song_id,)) 
+        c.executemany('DELETE FROM playlist_songs WHERE playlist_id = ? AND song_id = ?',
+                      [(playlist_id, song_id) for song_id, _ in rows])
+        c.executemany('DELETE FROM songs WHERE id = ?', [(song_id,) for song_id, _ in rows])
+        conn.commit()
+        last_id = rows[-1][0]
     
     if deleted_count > 0:
         log_message(f"YouTube cleanup: Deleted {deleted_count} orphaned song records and files for playlist ID {playlist_id}.")
     
-    # 3. Add/Link New Songs
-    added_count = 0
-    for entry in youtube_entries:
-        video_id = entry.get('id')
-        if not video_id: continue
-        
-        title = entry.get('title', 'Unknown')
-        
-        # Check if song exists globally in the songs table
-        c.execute('SELECT id, downloaded FROM songs WHERE video_id = ?', (video_id,))
-        song = c.fetchone()
-        
-        if not song:
-            # Insert new song
-            c.execute('''INSERT INTO songs (video_id, title, downloaded)
-                         VALUES (?, ?, ?)''',
-                      (video_id, title, 0))
-            song_id = c.lastrowid
-            added_count += 1
-        else:
-            song_id = song[0]
-            
-        # Link song to playlist (INSERT OR IGNORE prevents duplicates)
-        c.execute('''INSERT OR IGNORE INTO playlist_songs (playlist_id, song_id)
-                     VALUES (?, ?)''', (playlist_id, song_id))
-    
     # 4. Update Playlist Total Songs
-    total_songs = len(youtube_entries)
     c.execute('UPDATE playlists SET total_songs = ? WHERE id = ?', (total_songs, playlist_id))
     c.execute('UPDATE playlists SET last_sync = ? WHERE id = ?', (datetime.now(), playlist_id))
 
@@ -426,48 +837,39 @@ def add_playlist():
             return jsonify({'error': 'Playlist already exists'}), 400
         conn_check.close()
 
-        # Fetch playlist info
-        info = fetch_playlist_info(url)
-        
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
-        # Insert playlist
-        playlist_name = info.get('title', 'Unknown Playlist')
-        total_songs = len(info.get('entries', []))
-        
-        c.execute('''INSERT INTO playlists (name, url, total_songs, last_sync)
-                     VALUES (?, ?, ?, ?)''',
-                  (playlist_name, url, total_songs, datetime.now()))
-        playlist_id = c.lastrowid
-        
-        # Add songs to database
-        added_count = 0
-        
-        for entry in info.get('entries', []):
-            video_id = entry.get('id')
-            title = entry.get('title', 'Unknown')
-            
-            # Check if song exists
-            c.execute('SELECT id, downloaded FROM songs WHERE video_id = ?', (video_id,))
-            song = c.fetchone()
+        # Stream playlist entries straight into the database
+        with open_playlist_stream(url) as (playlist_name, entries):
+            # Claim the info-sync slot in the same step as creating the row, so
+            # info_update_loop can't start a second sync while we're streaming
+            with info_sync_lock:
+                conn = sqlite3.connect(DB_PATH)
+                c = conn.cursor()
+                c.execute('''INSERT INTO playlists (name, url, total_songs, last_sync)
+                             VALUES (?, ?, ?, ?)''',
+                          (playlist_name, url, 0, datetime.now()))
+                playlist_id = c.lastrowid
+                conn.commit()
+                conn.close()
+                info_syncs_in_progress.add(playlist_id)
             
-            if not song:
-                # Insert new song
-                c.execute('''INSERT INTO songs (video_id, title, downloaded)
-                             VALUES (?, ?, ?)''',
-                          (video_id, title, 0))
-                song_id = c.lastrowid
-                added_count += 1
-            else:
-                song_id = song[0]
-
-            # Link song to playlist
-            c.execute('''INSERT OR IGNORE INTO playlist_songs (playlist_id, song_id)
-                         VALUES (?, ?)''', (playlist_id, song_id))
-        
-        conn.commit()
-        conn.close()
+            try:
+                total_songs, added_count, _ = sync_db_with_youtube_info(playlist_id, entries)
+            except Exception:
+                # Don't leave a half-imported playlist (or its songs) behind
+                conn = sqlite3.connect(DB_PATH)
+                c = conn.cursor()
+                c.execute('''DELETE FROM songs
+                             WHERE id IN (SELECT song_id FROM playlist_songs WHERE playlist_id = ?)
+                               AND id NOT IN (SELECT song_id FROM playlist_songs WHERE playlist_id != ?)''',
+                          (playlist_id, playlist_id))
+                c.execute('DELETE FROM playlist_songs WHERE playlist_id = ?', (playlist_id,))
+                c.execute('DELETE FROM playlists WHERE id = ?', (playlist_id,))
+                conn.commit()
+                conn.close()
+                raise
+            finally:
+                with info_sync_lock:
+                    info_syncs_in_progress.discard(playlist_id)
         
         log_message(f'Added playlist: {playlist_name} ({total_songs} songs found)')
         
@@ -569,8 +971,8 @@ def download_playlist(playlist_id, only_info_sync=False):
     
     # --- STEP 1: Always perform an info sync first to ensure DB is current ---
     try:
-        youtube_info = fetch_playlist_info(url)
-        sync_db_with_youtube_info(playlist_id, youtube_info)
+        with open_playlist_stream(url) as (_, entries):
+            sync_db_with_youtube_info(playlist_id, entries)
     except Exception as e:
         log_message(f'Error during info sync for ID {playlist_id}: {str(e)}')
         return
@@ -601,6 +1003,11 @@ def download_playlist(playlist_id, only_info_sync=False):
         conn.close()
         return
 
+    artwork_hits = 0
+    artwork_misses = 0
+    artwork_fetched_bytes = 0
+    artwork_saved_bytes = 0
+
     for song_id, video_id, title in songs_to_download:
         try:
             active_downloads[playlist_id] = {'current_song': title} 
@@ -609,7 +1016,18 @@ def download_playlist(playlist_id, only_info_sync=False):
             opts = get_ydl_opts(output_dir, bitrate, playlist_id, song_id) 
             
             with yt_dlp.YoutubeDL(opts) as ydl:
-                ydl.download([video_url])
+                info = ydl.extract_info(video_url, download=True)
+            
+            # Cover art comes from the shared cache instead of a per-song thumbnail
+            artwork = embed_artwork(opts['logger'].filename, info, output_dir, settings)
+            if artwork:
+                fetched_bytes, saved_bytes = artwork
+                if fetched_bytes:
+                    artwork_misses += 1
+                    artwork_fetched_bytes += fetched_bytes
+                else:
+                    artwork_hits += 1
+                    artwork_saved_bytes += saved_bytes
             
             conn_dl = sqlite3.connect(DB_PATH)
             c_dl = conn_dl.cursor()
@@ -625,9 +1043,21 @@ def download_playlist(playlist_id, only_info_sync=False):
     if playlist_id in active_downloads:
         del active_downloads[playlist_id]
     
+    if artwork_hits or artwork_misses:
+        log_message(f'Artwork cache for {playlist_name}: {artwork_hits} reused ({artwork_saved_bytes // 1024} KB not downloaded), '
+                    f'{artwork_misses} fetched ({artwork_fetched_bytes // 1024} KB).')
+    
     log_message(f'Completed execution sync for: {playlist_name}')
     conn.close()
 
+def run_info_sync(playlist_id):
+    """Info-only sync that releases the playlist's in-progress slot when done."""
+    try:
+        download_playlist(playlist_id, only_info_sync=True)
+    finally:
+        with info_sync_lock:
+            info_syncs_in_progress.discard(playlist_id)
+
 # --- NEW: Continuous Information Sync Loop ---
 def info_update_loop():
     """Background thread to rapidly update DB info for a responsive UI."""
@@ -640,8 +1070,14 @@ def info_update_loop():
         conn.close()
         
         for pid in playlist_ids:
+            # Skip playlists whose previous info sync is still streaming
+            with info_sync_lock:
+                if pid in info_syncs_in_progress:
+                    continue
+                info_syncs_in_progress.add(pid)
+            
             # Run info-sync only: no downloads, just counter/cleanup updates
-            thread = threading.Thread(target=download_playlist, args=(pid,), kwargs={'only_info_sync': True})
+            thread = threading.Thread(target=run_info_sync, args=(pid,))
             thread.daemon = True
             thread.start()
         
@@ -696,9 +1132,297 @@ def scheduled_download_loop():
         
         time.sleep(60) # Check conditions every minute
 
+# --- Database Backups ---
+class BackupRestartLimit(Exception):
+    """Raised from the backup progress callback to stop a repeatedly restarted copy"""
+
+def backup_database():
+    """
+    Copy the live database with SQLite's online backup API.
+    Pages are copied in small steps with a short sleep in between, so
+    writers only wait for one step at a time instead of the whole copy.
+    """
+    BACKUP_DIR.mkdir(exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    backup_path = BACKUP_DIR / f'playlists-{stamp}.db'
+    # Thread id keeps a scheduled and a manual backup in the same second apart
+    tmp_path = BACKUP_DIR / f'playlists-{stamp}.{threading.get_ident()}.db.part'
+
+    # A write from another connection restarts a stepped backup from page 0,
+    # so a busy downloader could keep it from ever finishing
+    state = {'remaining': None, 'restarts': 0}
+    def on_progress(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > BACKUP_MAX_RESTARTS:
+                raise BackupRestartLimit()
+        state['remaining'] = remaining
+
+    src = sqlite3.connect(DB_PATH)
+    dst = sqlite3.connect(tmp_path)
+    completed = False
+    try:
+        try:
+            src.backup(dst, pages=BACKUP_PAGES_PER_STEP, progress=on_progress, sleep=0.01)
+        except BackupRestartLimit:
+            # Copy in one pass instead; in WAL mode this read never blocks writers
+            log_message("Backup: Database kept changing, finishing with a single-pass copy.")
+            src.backup(dst)
+        completed = True
+    finally:
+        dst.close()
+        src.close()
+        # A failed copy must not linger: list_backups/prune_backups only see *.db
+        if not completed and tmp_path.exists():
+            os.remove(tmp_path)
+
+    # Only complete copies ever carry the .db name
+    os.replace(tmp_path, backup_path)
+    log_message(f"Backup: Saved {backup_path.name} ({backup_path.stat().st_size // 1024} KB).")
+
+    prune_backups()
+    return backup_path
+
+def list_backups():
+    """Return completed backup files, newest first"""
+    if not BACKUP_DIR.exists():
+        return []
+    return sorted(BACKUP_DIR.glob('playlists-*.db'), reverse=True)
+
+def prune_backups():
+    """Delete backups beyond the configured retention count"""
+    settings = get_settings()
+    try:
+        keep = max(int(settings.get('backup_keep', '4')), 1)
+    except ValueError:
+        keep = 4
+
+    for old_backup in list_backups()[keep:]:
+        try:
+            os.remove(old_backup)
+            log_message(f"Backup: Removed old backup {old_backup.name}")
+        except OSError as e:
+            log_message(f"Error removing old backup {old_backup.name}: {e}")
+
+    # Partial copies left behind by a crash or kill; live ones are touched every step
+    for partial in BACKUP_DIR.glob('*.db.part'):
+        try:
+            if time.time() - partial.stat().st_mtime > 3600:
+                os.remove(partial)
+        except OSError:
+            pass
+
+def backup_loop():
+    """Background thread to take a database backup every backup_interval_days."""
+    while True:
+        settings = get_settings()
+
+        if settings.get('backup_enabled') == 'true':
+            try:
+                interval_days = max(float(settings.get('backup_interval_days', '7')), 0)
+                # The newest backup file is the record of when we last ran
+                backups = list_backups()
+                due = (not backups or
+                       time.time() - backups[0].stat().st_mtime >= interval_days * 86400)
+
+                if due:
+                    backup_database()
+
+            except Exception as e:
+                log_message(f"Error in backup loop: {e}")
+
+        time.sleep(3600) # Check conditions every hour
+
+# --- Export / Import (gzip-compressed JSON Lines) ---
+def iter_export_records():
+    """Yield export records: a header, every playlist, then songs in chunks"""
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        # One read transaction for the whole export so playlists, songs and links
+        # come from the same snapshot; in WAL mode this doesn't block writers
+        c.execute('BEGIN')
+
+        yield {'type': 'header', 'version': EXPORT_FORMAT_VERSION, 'exported': datetime.now().isoformat()}
+
+        c.execute('SELECT id, name, url, total_songs, last_sync FROM playlists')
+        for playlist_id, name, url, total_songs, last_sync in c.fetchall():
+            yield {'type': 'playlist', 'id': playlist_id, 'name': name, 'url': url,
+                   'total': total_songs, 'lastSync': last_sync}
+
+        last_id = 0
+        while True:
+            c.execute('''SELECT s.id, s.video_id, s.title, s.artist, s.filename, s.downloaded, s.added_date,
+                                (SELECT group_concat(ps.playlist_id) FROM playlist_songs ps WHERE ps.song_id = s.id)
+                         FROM songs s
+                         WHERE s.id > ?
+                         ORDER BY s.id LIMIT ?''', (last_id, SYNC_CHUNK_SIZE))
+            rows = c.fetchall()
+            if not rows:
+                break
+
+            for song_id, video_id, title, artist, filename, downloaded, added_date, playlist_ids in rows:
+                yield {'type': 'song', 'videoId': video_id, 'title': title, 'artist': artist,
+                       'filename': filename, 'downloaded': bool(downloaded), 'added': added_date,
+                       'playlists': [int(pid) for pid in playlist_ids.split(',')] if playlist_ids else []}
+            last_id = rows[-1][0]
+    finally:
+        # Also runs when the client disconnects and the generator is closed early
+        conn.close()
+
+def iter_export_gzip():
+    """Stream the export as gzip-compressed JSON Lines"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) # wbits=31 -> gzip container
+    buffer = []
+    for record in iter_export_records():
+        buffer.append(json.dumps(record, separators=(',', ':')) + '\n')
+        if len(buffer) >= SYNC_CHUNK_SIZE:
+            data = compressor.compress(''.join(buffer).encode())
+            buffer = []
+            if data:
+                yield data
+    yield compressor.compress(''.join(buffer).encode()) + compressor.flush()
+
+def iter_import_records(stream):
+    """Decode gzip (or plain) JSON Lines from a file-like object, one record at a time"""
+    decompressor = zlib.decompressobj(31) # wbits=31 -> gzip container
+    pending = b''
+    first = stream.read(64 * 1024)
+    is_gzip = first[:2] == b'\x1f\x8b'
+    chunk = first
+
+    while chunk:
+        pending += decompressor.decompress(chunk) if is_gzip else chunk
+        *lines, pending = pending.split(b'\n')
+        for line in lines:
+            if line.strip():
+                yield json.loads(line)
+        chunk = stream.read(64 * 1024)
+
+    if is_gzip:
+        pending += decompressor.flush()
+        if not decompressor.eof:
+            raise ValueError('Export file is truncated')
+    if pending.strip():
+        yield json.loads(pending)
+
+def stage_import_records(c, records):
+    """
+    Validate exported records into TEMP staging tables.
+    TEMP tables live in the connection's temp database, so this phase never
+    takes the main database's write lock however large the file is.
+    Returns (playlist_count, song_count); raises ValueError on bad input.
+    """
+    c.execute('''CREATE TEMP TABLE import_playlists (
+        export_id INTEGER PRIMARY KEY, name TEXT NOT NULL, url TEXT NOT NULL,
+        total_songs INTEGER, last_sync TIMESTAMP
+    )''')
+    c.execute('''CREATE TEMP TABLE import_songs (
+        seq INTEGER PRIMARY KEY, video_id TEXT NOT NULL, title TEXT NOT NULL, artist TEXT,
+        filename TEXT, downloaded INTEGER, added_date TIMESTAMP
+    )''')
+    c.execute('CREATE TEMP TABLE import_links (export_playlist_id INTEGER, video_id TEXT)')
+
+    playlist_count = 0
+    song_count = 0
+    seen_header = False
+
+    for chunk in iter_chunks(records, SYNC_CHUNK_SIZE):
+        playlists = []
+        songs = []
+        links = []
+        for record in chunk:
+            record_type = record.get('type')
+
+            if record_type == 'header':
+                if record.get('version') != EXPORT_FORMAT_VERSION:
+                    raise ValueError(f"Unsupported export version: {record.get('version')}")
+                seen_header = True
+
+            elif not seen_header:
+                raise ValueError('Not an export file: missing header record')
+
+            elif record_type == 'playlist':
+                if record.get('id') is None or not record.get('name') or not record.get('url'):
+                    raise ValueError(f'Playlist record is missing id, name or url: {record}')
+                playlists.append((record['id'], record['name'], record['url'],
+                                  record.get('total', 0), record.get('lastSync')))
+
+            elif record_type == 'song':
+                if not record.get('videoId'):
+                    raise ValueError(f'Song record is missing videoId: {record}')
+                songs.append((record['videoId'], record.get('title') or 'Unknown', record.get('artist'),
+                              record.get('filename'), int(bool(record.get('downloaded'))),
+                              record.get('added') or datetime.now()))
+                links.extend((pid, record['videoId']) for pid in record.get('playlists', []))
+
+        c.executemany('''INSERT OR REPLACE INTO import_playlists (export_id, name, url, total_songs, last_sync)
+                         VALUES (?, ?, ?, ?, ?)''', playlists)
+        c.executemany('''INSERT INTO import_songs (video_id, title, artist, filename, downloaded, added_date)
+                         VALUES (?, ?, ?, ?, ?, ?)''', songs)
+        c.executemany('INSERT INTO import_links (export_playlist_id, video_id) VALUES (?, ?)', links)
+        playlist_count += len(playlists)
+        song_count += len(songs)
+
+    if not seen_header:
+        raise ValueError('Not an export file: missing header record')
+
+    return playlist_count, song_count
+
+def import_records(records):
+    """
+    Import an export in two phases so a bad or truncated file changes nothing
+    and other writers are never blocked for long:
+    1. Parse and validate everything into TEMP staging tables.
+    2. Merge into the library in SYNC_CHUNK_SIZE batches, committing after each.
+    Playlists are matched by URL and songs by video ID, so importing
+    twice (or into a non-empty library) never creates duplicates.
+    """
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        playlist_count, song_count = stage_import_records(c, records)
+        conn.commit()
+
+        c.execute('''INSERT OR IGNORE INTO playlists (name, url, total_songs, last_sync)
+                     SELECT name, url, total_songs, last_sync FROM import_playlists''')
+        conn.commit()
+
+        # Keep existing rows, but take over download state the local DB doesn't have yet
+        for start in range(0, song_count, SYNC_CHUNK_SIZE):
+            c.execute('''INSERT INTO songs (video_id, title, artist, filename, downloaded, added_date)
+                         SELECT video_id, title, artist, filename, downloaded, added_date
+                         FROM import_songs WHERE seq > ? AND seq <= ?
+                         ON CONFLICT(video_id) DO UPDATE SET
+                             filename = COALESCE(songs.filename, excluded.filename),
+                             downloaded = MAX(songs.downloaded, excluded.downloaded)''',
+                      (start, start + SYNC_CHUNK_SIZE))
+            conn.commit()
+
+        c.execute('SELECT COALESCE(MAX(rowid), 0) FROM import_links')
+        link_count = c.fetchone()[0]
+        for start in range(0, link_count, SYNC_CHUNK_SIZE):
+            c.execute('''INSERT OR IGNORE INTO playlist_songs (playlist_id, song_id)
+                         SELECT p.id, s.id
+                         FROM import_links l
+                         JOIN import_playlists ip ON ip.export_id = l.export_playlist_id
+                         JOIN playlists p ON p.url = ip.url
+                         JOIN songs s ON s.video_id = l.video_id
+                         WHERE l.rowid > ? AND l.rowid <= ?''',
+                      (start, start + SYNC_CHUNK_SIZE))
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        # Closing the connection also drops the TEMP staging tables
+        conn.close()
+
+    return playlist_count, song_count
+
 def start_background_threads():
     """Start all perpetual background threads."""
-    global info_thread, scheduler_thread
+    global info_thread, scheduler_thread, backup_thread
     
     if info_thread is None or not info_thread.is_alive():
         log_message("Starting continuous info update loop.")
@@ -712,6 +1436,83 @@ def start_background_threads():
         scheduler_thread.daemon = True
         scheduler_thread.start()
 
+    if backup_thread is None or not backup_thread.is_alive():
+        log_message("Starting database backup loop.")
+        backup_thread = threading.Thread(target=backup_loop)
+        backup_thread.daemon = True
+        backup_thread.start()
+
+@app.route('/api/search', methods=['GET'])
+def search_songs():
+    """
+    Ranked, paginated prefix search over song title, artist and playlist names.
+    Only the newest SEARCH_MAX_CANDIDATES matches are ranked, which keeps very
+    broad queries fast; narrower queries rank every match.
+    """
+    query = build_fts_query(request.args.get('q', ''))
+    if not query:
+        return jsonify({'error': f'Query parameter q needs a word of at least {SEARCH_MIN_TERM_LENGTH} characters'}), 400
+    
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 50)), 1), 200)
+    except ValueError:
+        return jsonify({'error': 'page and limit must be integers'}), 400
+    
+    conn = sqlite3.connect(DB_PATH)
+    c = conn.cursor()
+    try:
+        # Walking the doclist in rowid order is cheap; scoring every match is not.
+        # The lowest rowid among the newest candidates bounds the ranked set.
+        c.execute('''SELECT rowid FROM songs_fts WHERE songs_fts MATCH ?
+                     ORDER BY rowid DESC LIMIT 1 OFFSET ?''', (query, SEARCH_MAX_CANDIDATES - 1))
+        cutoff = c.fetchone()
+        min_rowid = cutoff[0] if cutoff else 0
+        
+        # Rank inside FTS5 and only join songs for this page.
+        # Fetch one extra row to know whether another page exists.
+        c.execute('''SELECT s.id, s.video_id, s.title, s.artist, s.filename, s.downloaded
+                     FROM (SELECT rowid, rank FROM songs_fts
+                           WHERE songs_fts MATCH ? AND rowid >= ?
+                           ORDER BY rank LIMIT ? OFFSET ?) m
+                     JOIN songs s ON s.id = m.rowid
+                     ORDER BY m.rank''',
+                  (query, min_rowid, limit + 1, (page - 1) * limit))
+        rows = c.fetchall()
+        
+        # Playlist names for the page, as a list (the FTS column is space-joined)
+        song_ids = [row[0] for row in rows[:limit]]
+        playlists = {song_id: [] for song_id in song_ids}
+        if song_ids:
+            c.execute(f'''SELECT ps.song_id, p.name
+                          FROM playlist_songs ps
+                          JOIN playlists p ON p.id = ps.playlist_id
+                          WHERE ps.song_id IN ({','.join('?' * len(song_ids))})
+                          ORDER BY p.name''', song_ids)
+            for song_id, name in c.fetchall():
+                playlists[song_id].append(name)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        return jsonify({'error': f'Search failed: {e}'}), 500
+    conn.close()
+    
+    results = [{
+        'id': row[0],
+        'videoId': row[1],
+        'title': row[2],
+        'artist': row[3],
+        'filename': row[4],
+        'downloaded': bool(row[5]),
+        'playlists': playlists[row[0]]
+    } for row in rows[:limit]]
+    
+    return jsonify({
+        'results': results,
+        'page': page,
+        'limit': limit,
+        'hasMore': len(rows) > limit
+    })
+
 # API for logs
 @app.route('/api/logs', methods=['GET'])
 def get_logs():
@@ -736,6 +1537,57 @@ def update_settings():
     log_message('Settings updated')
     return jsonify({'success': True})
 
+@app.route('/api/backups', methods=['GET'])
+def get_backups():
+    """List completed database backups"""
+    return jsonify([{
+        'name': backup.name,
+        'size': backup.stat().st_size,
+        'created': datetime.fromtimestamp(backup.stat().st_mtime).isoformat()
+    } for backup in list_backups()])
+
+@app.route('/api/backups', methods=['POST'])
+def create_backup():
+    """Take a database backup now"""
+    try:
+        backup_path = backup_database()
+    except Exception as e:
+        log_message(f"Error creating backup: {e}")
+        return jsonify({'error': f'Backup failed: {e}'}), 500
+    return jsonify({'success': True, 'name': backup_path.name})
+
+@app.route('/api/export', methods=['GET'])
+def export_state():
+    """Stream playlists and download state as gzip-compressed JSON Lines"""
+    filename = f"open-playlist-dl-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz"
+    return Response(
+        stream_with_context(iter_export_gzip()),
+        mimetype='application/gzip',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+@app.route('/api/import', methods=['POST'])
+def import_state():
+    """Import an export file (multipart 'file' field or raw request body)"""
+    # Touching request.files parses (and consumes) the body, so only do it for
+    # real multipart uploads; curl --data-binary sends a form-urlencoded type
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if not upload:
+            return jsonify({'error': "Multipart upload needs a 'file' field"}), 400
+        stream = upload.stream
+    else:
+        stream = request.stream
+
+    try:
+        playlist_count, song_count = import_records(iter_import_records(stream))
+    except Exception as e:
+        log_message(f"Error importing state: {e}")
+        return jsonify({'error': f'Import failed: {e}'}), 400
+
+    log_message(f'Imported {playlist_count} playlists and {song_count} songs')
+    return jsonify({'success': True, 'playlists': playlist_count, 'songs': song_count})
+
 if __name__ == '__main__':
     init_db()
     test_ffmpeg_thumbnail_support()
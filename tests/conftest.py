@@ -0,0 +1,22 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import app as app_module
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """The app module pointed at a fresh database and data directories under tmp_path"""
+    monkeypatch.setattr(app_module, 'DB_PATH', tmp_path / 'playlists.db')
+    monkeypatch.setattr(app_module, 'ARTWORK_DIR', tmp_path / 'artwork')
+    monkeypatch.setattr(app_module, 'BACKUP_DIR', tmp_path / 'backups')
+    monkeypatch.setattr(app_module, 'log_message', lambda message: None)
+    monkeypatch.setattr(app_module, 'artwork_in_flight', {})
+    monkeypatch.setattr(app_module, 'artwork_in_use', {})
+    (tmp_path / 'artwork').mkdir()
+    app_module.init_db()
+    return app_module
@@ -0,0 +1,65 @@
+"""add_playlist: a failed stream leaves nothing behind and blocks concurrent info syncs."""
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+
+
+def count(app, table):
+    conn = sqlite3.connect(app.DB_PATH)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def client(app):
+    return app.app.test_client()
+
+
+def stub_stream(monkeypatch, app, entries):
+    @contextmanager
+    def fake_stream(url):
+        yield 'New Playlist', entries()
+    monkeypatch.setattr(app, 'open_playlist_stream', fake_stream)
+
+
+def test_failed_stream_removes_playlist_and_its_songs(app, client, monkeypatch):
+    # A song that already belongs to another playlist must survive the rollback
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.execute("INSERT INTO playlists (name, url) VALUES ('Existing', 'https://example.invalid/existing')")
+    conn.execute("INSERT INTO songs (video_id, title) VALUES ('shared', 'Shared song')")
+    conn.execute('INSERT INTO playlist_songs (playlist_id, song_id) VALUES (1, 1)')
+    conn.commit()
+    conn.close()
+
+    seen_in_progress = []
+
+    def entries():
+        yield {'id': 'shared', 'title': 'Shared song'}
+        for i in range(1200): # spans several committed chunks
+            yield {'id': f'new{i}', 'title': f'Song {i}'}
+        seen_in_progress.append(set(app.info_syncs_in_progress))
+        raise RuntimeError('connection reset')
+
+    stub_stream(monkeypatch, app, entries)
+    response = client.post('/api/playlists', json={'url': 'https://example.invalid/new'})
+
+    assert response.status_code == 500
+    assert seen_in_progress == [{2}]
+    assert app.info_syncs_in_progress == set()
+    assert count(app, 'playlists') == 1
+    assert count(app, 'songs') == 1
+    assert count(app, 'playlist_songs') == 1
+    assert count(app, 'songs_fts') == 1
+
+
+def test_successful_add_reports_new_songs(app, client, monkeypatch):
+    stub_stream(monkeypatch, app, lambda: ({'id': f'v{i}', 'title': f'Song {i}'} for i in range(1200)))
+    response = client.post('/api/playlists', json={'url': 'https://example.invalid/new'})
+
+    assert response.status_code == 200
+    assert response.json['total'] == 1200
+    assert response.json['added'] == 1200
+    assert app.info_syncs_in_progress == set()
@@ -0,0 +1,91 @@
+"""Shared artwork cache: reuse by URL and album, size changes and LRU eviction."""
+import hashlib
+
+import pytest
+
+
+@pytest.fixture
+def renders(app, monkeypatch):
+    """Replace the network fetch + ffmpeg render with a stub that records calls"""
+    calls = []
+
+    def fake_render(thumbnail_url, art_size, cover_bytes=300 * 1024):
+        calls.append((thumbnail_url, art_size))
+        art_hash = hashlib.sha1(f'{thumbnail_url}|{art_size}'.encode()).hexdigest()
+        cover_path = app.ARTWORK_DIR / f'{art_hash}.jpg'
+        cover_path.write_bytes(b'\0' * cover_bytes)
+        return art_hash, cover_path, 1000
+
+    monkeypatch.setattr(app, 'render_artwork', fake_render)
+    return calls
+
+
+def song(video_id, album=None):
+    info = {'thumbnail': f'https://i.ytimg.com/vi/{video_id}/hq.jpg', 'artist': 'Artist'}
+    if album:
+        info['album'] = album
+    return info
+
+
+def fetch(app, info, **settings):
+    """get_cached_artwork + release, the way embed_artwork uses it"""
+    art_hash, cover_path, fetched_bytes, saved_bytes = app.get_cached_artwork(info, settings)
+    app.release_artwork(art_hash)
+    return art_hash, fetched_bytes, saved_bytes
+
+
+def test_same_url_is_fetched_once(app, renders):
+    first = fetch(app, song('a'))
+    second = fetch(app, song('a'))
+
+    assert len(renders) == 1
+    assert first[1:] == (1000, 0)
+    assert second == (first[0], 0, 1000)
+
+
+def test_album_tracks_with_different_urls_share_one_fetch(app, renders):
+    hashes = {fetch(app, song(video_id, album='Album'))[0] for video_id in 'abc'}
+
+    assert len(renders) == 1
+    assert len(hashes) == 1
+
+
+def test_artwork_size_change_renders_again(app, renders):
+    small = fetch(app, song('a'), artwork_size='300')
+    large = fetch(app, song('a'), artwork_size='600')
+    fetch(app, song('a'), artwork_size='600')
+
+    assert [size for _, size in renders] == [300, 600]
+    assert small[0] != large[0]
+
+
+def test_url_key_wins_over_album_key(app, renders):
+    own_cover = fetch(app, song('a'))[0]
+    album_cover = fetch(app, song('b', album='Album'))[0]
+
+    # Track 'a' now also carries the album key, which points at a different cover
+    for _ in range(3):
+        assert fetch(app, song('a', album='Album'))[0] == own_cover
+    assert fetch(app, song('c', album='Album'))[0] == album_cover
+
+
+def test_least_recently_used_cover_is_evicted(app, renders):
+    # Three 300 KB covers fit in 1 MB; the fourth pushes out the oldest
+    hashes = [fetch(app, song(video_id), artwork_cache_mb='1')[0] for video_id in 'abc']
+    fetch(app, song('a'), artwork_cache_mb='1') # 'a' becomes most recently used
+    fetch(app, song('d'), artwork_cache_mb='1')
+
+    on_disk = {path.stem for path in app.ARTWORK_DIR.glob('*.jpg')}
+    assert hashes[1] not in on_disk
+    assert {hashes[0], hashes[2]} <= on_disk
+
+
+def test_cover_in_use_is_not_evicted(app, renders):
+    held_hash, held_path, _, _ = app.get_cached_artwork(song('a'), {'artwork_cache_mb': '1'})
+    for video_id in 'bcde':
+        fetch(app, song(video_id), artwork_cache_mb='1')
+
+    assert held_path.exists()
+    app.release_artwork(held_hash)
+    fetch(app, song('f'), artwork_cache_mb='1')
+    assert not held_path.exists()
@@ -0,0 +1,85 @@
+"""Online database backups: complete copies, failure cleanup and retention."""
+import os
+import sqlite3
+import threading
+import time
+
+import pytest
+
+
+def test_backup_is_a_complete_copy(app):
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.executemany('INSERT INTO songs (video_id, title) VALUES (?, ?)', [(f'v{i}', f'Song {i}') for i in range(2000)])
+    conn.commit()
+    conn.close()
+
+    backup_path = app.backup_database()
+
+    copy = sqlite3.connect(backup_path)
+    assert copy.execute('PRAGMA integrity_check').fetchone() == ('ok',)
+    assert copy.execute('SELECT COUNT(*) FROM songs').fetchone() == (2000,)
+    copy.close()
+    assert list(app.BACKUP_DIR.glob('*.part')) == []
+
+
+def test_failed_backup_leaves_no_partial_file(app, monkeypatch):
+    real_connect = sqlite3.connect
+
+    class FailingSource:
+        def __init__(self, *args, **kwargs):
+            self.conn = real_connect(*args, **kwargs)
+
+        def backup(self, target, **kwargs):
+            raise sqlite3.OperationalError('disk I/O error')
+
+        def close(self):
+            self.conn.close()
+
+    def connect(path, *args, **kwargs):
+        if path == app.DB_PATH:
+            return FailingSource(path, *args, **kwargs)
+        return real_connect(path, *args, **kwargs)
+
+    monkeypatch.setattr(app.sqlite3, 'connect', connect)
+    with pytest.raises(sqlite3.OperationalError):
+        app.backup_database()
+
+    assert list(app.BACKUP_DIR.iterdir()) == []
+
+
+def test_concurrent_backups_in_the_same_second(app):
+    errors = []
+
+    def run():
+        try:
+            app.backup_database()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert list(app.BACKUP_DIR.glob('*.part')) == []
+    for backup_path in app.list_backups():
+        copy = sqlite3.connect(backup_path)
+        assert copy.execute('PRAGMA integrity_check').fetchone() == ('ok',)
+        copy.close()
+
+
+def test_retention_and_stale_partial_cleanup(app):
+    app.save_setting('backup_keep', '2')
+    app.BACKUP_DIR.mkdir()
+    for day in range(1, 5):
+        (app.BACKUP_DIR / f'playlists-2026010{day}-030000.db').write_bytes(b'')
+    stale = app.BACKUP_DIR / 'playlists-20260101-030000.1.db.part'
+    stale.write_bytes(b'')
+    os.utime(stale, (time.time() - 7200, time.time() - 7200))
+
+    app.prune_backups()
+
+    assert [path.name for path in app.list_backups()] == ['playlists-20260104-030000.db', 'playlists-20260103-030000.db']
+    assert not stale.exists()
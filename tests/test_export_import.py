@@ -0,0 +1,95 @@
+"""Export/import: a round trip into a fresh database, re-imports and bad files."""
+import gzip
+import io
+import json
+import sqlite3
+
+import pytest
+
+
+def rows(app, query):
+    conn = sqlite3.connect(app.DB_PATH)
+    try:
+        return sorted(conn.execute(query).fetchall())
+    finally:
+        conn.close()
+
+
+def library(app):
+    return {
+        'playlists': rows(app, 'SELECT name, url FROM playlists'),
+        'songs': rows(app, 'SELECT video_id, title, artist, filename, downloaded FROM songs'),
+        'links': rows(app, '''SELECT p.url, s.video_id FROM playlist_songs ps
+                              JOIN playlists p ON p.id = ps.playlist_id
+                              JOIN songs s ON s.id = ps.song_id'''),
+    }
+
+
+@pytest.fixture
+def exported(app):
+    """An export of two playlists sharing some songs, a few of them downloaded"""
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.execute("INSERT INTO playlists (name, url) VALUES ('First', 'https://example.invalid/first')")
+    conn.execute("INSERT INTO playlists (name, url) VALUES ('Second', 'https://example.invalid/second')")
+    conn.commit()
+    conn.close()
+
+    app.sync_db_with_youtube_info(1, [{'id': f'v{i}', 'title': f'Song {i}'} for i in range(1200)])
+    app.sync_db_with_youtube_info(2, [{'id': f'v{i}', 'title': f'Song {i}'} for i in range(1000, 1700)])
+
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.execute("UPDATE songs SET downloaded = 1, filename = video_id || '.mp3' WHERE id % 7 = 0")
+    conn.commit()
+    conn.close()
+
+    response = app.app.test_client().get('/api/export')
+    assert response.status_code == 200
+    return response.data, library(app)
+
+
+def post_import(app, data):
+    return app.app.test_client().post('/api/import', data=data, content_type='application/gzip')
+
+
+def test_round_trip_into_fresh_database(app, exported, tmp_path, monkeypatch):
+    data, original = exported
+    monkeypatch.setattr(app, 'DB_PATH', tmp_path / 'fresh.db')
+    app.init_db()
+
+    response = post_import(app, data)
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True, 'playlists': 2, 'songs': 1700}
+    assert library(app) == original
+
+    # A second import of the same file changes nothing
+    response = post_import(app, data)
+    assert response.status_code == 200
+    assert library(app) == original
+    assert rows(app, 'SELECT COUNT(*) FROM songs_fts') == [(1700,)]
+
+
+def test_multipart_upload(app, exported, tmp_path, monkeypatch):
+    data, original = exported
+    monkeypatch.setattr(app, 'DB_PATH', tmp_path / 'fresh.db')
+    app.init_db()
+
+    response = app.app.test_client().post('/api/import', data={'file': (io.BytesIO(data), 'export.jsonl.gz')},
+                                          content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert library(app) == original
+
+
+def test_bad_files_leave_database_untouched(app, exported, tmp_path, monkeypatch):
+    data, _ = exported
+    monkeypatch.setattr(app, 'DB_PATH', tmp_path / 'fresh.db')
+    app.init_db()
+    empty = library(app)
+
+    records = [json.loads(line) for line in gzip.decompress(data).splitlines()]
+    no_header = gzip.compress(b'\n'.join(json.dumps(r).encode() for r in records[1:]))
+    bad_song = gzip.compress(b'\n'.join(json.dumps(r).encode() for r in records + [{'type': 'song'}]))
+
+    for body in (data[:len(data) // 2], no_header, bad_song):
+        response = post_import(app, body)
+        assert response.status_code == 400
+        assert library(app) == empty
@@ -0,0 +1,141 @@
+"""FTS5 search index: trigger maintenance, /api/search results and latency at 100k songs."""
+import random
+import sqlite3
+import statistics
+import time
+
+import pytest
+
+
+@pytest.fixture
+def client(app):
+    return app.app.test_client()
+
+
+def execute(app, *statements):
+    conn = sqlite3.connect(app.DB_PATH)
+    for statement in statements:
+        conn.execute(*statement) if isinstance(statement, tuple) else conn.execute(statement)
+    conn.commit()
+    conn.close()
+
+
+def search(client, q, **params):
+    response = client.get('/api/search', query_string={'q': q, **params})
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def titles(client, q):
+    return sorted(result['title'] for result in search(client, q)['results'])
+
+
+@pytest.fixture
+def library(app):
+    execute(app,
+            "INSERT INTO playlists (name, url) VALUES ('Road Trip', 'https://example.invalid/1')",
+            "INSERT INTO playlists (name, url) VALUES ('Chill', 'https://example.invalid/2')",
+            "INSERT INTO songs (video_id, title, artist) VALUES ('a', 'Bohemian Rhapsody', 'Queen')",
+            "INSERT INTO songs (video_id, title, artist) VALUES ('b', 'Under Pressure', 'Queen')")
+    return app
+
+
+def test_song_insert_is_searchable(library, client):
+    assert titles(client, 'boh') == ['Bohemian Rhapsody']
+    assert titles(client, 'queen') == ['Bohemian Rhapsody', 'Under Pressure']
+
+
+def test_song_update_reindexes(library, client):
+    execute(library, "UPDATE songs SET title = 'Radio Ga Ga' WHERE video_id = 'a'")
+    assert titles(client, 'boh') == []
+    assert titles(client, 'radio') == ['Radio Ga Ga']
+
+
+def test_link_rename_unlink_and_playlist_delete(library, client):
+    execute(library, 'INSERT INTO playlist_songs (playlist_id, song_id) VALUES (1, 1)')
+    assert titles(client, 'road trip') == ['Bohemian Rhapsody']
+
+    execute(library, "UPDATE playlists SET name = 'Night Drive' WHERE id = 1")
+    assert titles(client, 'road') == []
+    assert titles(client, 'night drive') == ['Bohemian Rhapsody']
+
+    execute(library, 'DELETE FROM playlist_songs WHERE playlist_id = 1 AND song_id = 1')
+    assert titles(client, 'night') == []
+
+    execute(library, 'INSERT INTO playlist_songs (playlist_id, song_id) VALUES (2, 2)')
+    assert titles(client, 'chill') == ['Under Pressure']
+    execute(library, 'DELETE FROM playlists WHERE id = 2')
+    assert titles(client, 'chill') == []
+
+
+def test_song_delete_removes_it_from_index(library, client):
+    execute(library, "DELETE FROM songs WHERE video_id = 'a'")
+    assert titles(client, 'queen') == ['Under Pressure']
+
+
+def test_results_list_playlists_separately(library, client):
+    execute(library,
+            'INSERT INTO playlist_songs (playlist_id, song_id) VALUES (1, 1)',
+            'INSERT INTO playlist_songs (playlist_id, song_id) VALUES (2, 1)')
+    [result] = search(client, 'bohemian')['results']
+    assert result['playlists'] == ['Chill', 'Road Trip']
+
+
+def test_title_outranks_playlist_name(library, client):
+    execute(library,
+            "INSERT INTO playlists (name, url) VALUES ('Pressure Cooker', 'https://example.invalid/3')",
+            'INSERT INTO playlist_songs (playlist_id, song_id) VALUES (3, 1)')
+    results = search(client, 'pressure')['results']
+    assert [result['title'] for result in results] == ['Under Pressure', 'Bohemian Rhapsody']
+
+
+def test_short_terms_are_ignored(library, client):
+    assert titles(client, 'a queen') == ['Bohemian Rhapsody', 'Under Pressure']
+    assert client.get('/api/search', query_string={'q': 'a'}).status_code == 400
+
+
+def test_pagination(library, client):
+    first = search(client, 'queen', limit=1)
+    second = search(client, 'queen', limit=1, page=2)
+    assert first['hasMore'] and not second['hasMore']
+    assert {first['results'][0]['title'], second['results'][0]['title']} == {'Bohemian Rhapsody', 'Under Pressure'}
+
+
+SONG_COUNT = 100_000
+LATENCY_BUDGET_MS = 10
+
+
+def test_search_latency_at_100k_songs(app, client):
+    rng = random.Random(0)
+    common = 'love night dance fire heart rain summer blue moon star dream road city'.split()
+    vocabulary = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 9))) for _ in range(5000)]
+    playlist_names = ['Road Trip', 'Chill', 'Gym Mix', 'Party']
+
+    conn = sqlite3.connect(app.DB_PATH)
+    conn.executemany('INSERT INTO playlists (name, url) VALUES (?, ?)',
+                     [(name, f'https://example.invalid/{name}') for name in playlist_names])
+    # Links first: the songs insert trigger then indexes playlist names in one pass
+    conn.executemany('INSERT INTO playlist_songs (playlist_id, song_id) VALUES (?, ?)',
+                     [(rng.randint(1, len(playlist_names)), song_id) for song_id in range(1, SONG_COUNT + 1)])
+    conn.executemany('INSERT INTO songs (id, video_id, title, artist) VALUES (?, ?, ?, ?)',
+                     [(song_id, f'video{song_id}',
+                       ' '.join([rng.choice(common)] + rng.choices(vocabulary, k=2)),
+                       rng.choice(vocabulary[:800]))
+                      for song_id in range(1, SONG_COUNT + 1)])
+    conn.commit()
+    conn.close()
+
+    queries = ['love', 'lo', 'ro', 'road trip', 'night dance', vocabulary[5][:4], vocabulary[7]]
+    timings = {}
+    for q in queries:
+        search(client, q) # warm the page cache
+        samples = []
+        for _ in range(7):
+            start = time.perf_counter()
+            search(client, q)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[q] = statistics.median(samples)
+
+    assert search(client, 'love')['hasMore']
+    slow = {q: round(ms, 1) for q, ms in timings.items() if ms >= LATENCY_BUDGET_MS}
+    assert not slow, f'median /api/search latency over {LATENCY_BUDGET_MS} ms: {slow}'
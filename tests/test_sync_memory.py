@@ -0,0 +1,76 @@
+"""Peak-memory checks for the streaming playlist reconciliation (sync_db_with_youtube_info)."""
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+resource = pytest.importorskip('resource') # ru_maxrss is Unix-only
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+ENTRY_COUNT = 50_000
+MAX_RSS_GROWTH_MB = 16
+
+# Runs in a fresh interpreter so ru_maxrss reflects only this sync, not earlier tests
+CHILD_SCRIPT = textwrap.dedent('''
+    import json, resource, sys
+    from pathlib import Path
+
+    sys.path.insert(0, sys.argv[1])
+    import app
+
+    def peak_rss_bytes():
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024 # Linux reports KB
+
+    def entries(count, step=1):
+        for i in range(0, count, step):
+            yield {'id': f'video{i:08d}', 'title': f'Song number {i} ' + 'x' * 80}
+
+    app.DB_PATH = Path(sys.argv[2]) / 'playlists.db'
+    app.log_message = lambda message: None
+    app.init_db()
+    app.save_setting('output_dir', sys.argv[2])
+
+    conn = app.sqlite3.connect(app.DB_PATH)
+    conn.execute("INSERT INTO playlists (name, url) VALUES ('Huge', 'https://example.invalid/huge')")
+    conn.commit()
+    conn.close()
+
+    count = int(sys.argv[3])
+    baseline = peak_rss_bytes()
+    added = app.sync_db_with_youtube_info(1, entries(count))
+    # Second pass drops every other song, exercising the removal path
+    removed = app.sync_db_with_youtube_info(1, entries(count, step=2))
+
+    growth = peak_rss_bytes() - baseline
+
+    conn = app.sqlite3.connect(app.DB_PATH)
+    rows = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+            for table in ('songs', 'playlist_songs', 'songs_fts')}
+    conn.close()
+
+    print(json.dumps({'growth': growth, 'added': added, 'removed': removed, 'rows': rows}))
+''')
+
+def run_sync(tmp_path, count):
+    result = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, str(REPO_DIR), str(tmp_path), str(count)],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_sync_peak_rss_is_bounded_at_50k_entries(tmp_path):
+    stats = run_sync(tmp_path, ENTRY_COUNT)
+
+    assert stats['added'] == [ENTRY_COUNT, ENTRY_COUNT, 0]
+    assert stats['removed'] == [ENTRY_COUNT // 2, 0, 0]
+    # The stale half must really be gone, not just left out of the returned totals
+    assert stats['rows'] == {'songs': ENTRY_COUNT // 2, 'playlist_songs': ENTRY_COUNT // 2,
+                             'songs_fts': ENTRY_COUNT // 2}
+    assert stats['growth'] < MAX_RSS_GROWTH_MB * 1024 * 1024, \
+        f"peak RSS grew by {stats['growth'] / 1024 / 1024:.1f} MB while syncing {ENTRY_COUNT} entries"